@@ -1,15 +1,11 @@
 import sys
-import os
-import io
-import logging
 import collections
-import json
+import functools
 import argparse
-import textwrap
 
-from .exchange import ExchangeFactory
+# exchange and cache modules pull in network and database libraries, so they
+# are imported only by the commands that need them
 from .asset import AssetFactory
-from .cache import delete_cache
 
 PROG = "cq"
 DESC = "Cryptocurrency quotes on the command line"
@@ -39,6 +35,8 @@ AUTHOR
            ).strip()
 
 def enable_verbose_logs():
+    import logging
+
     handler = logging.StreamHandler()
     handler.setFormatter(logging.Formatter('%(message)s'))
     logger = logging.getLogger()
@@ -46,6 +44,8 @@ def enable_verbose_logs():
     logger.setLevel(logging.INFO)
 
 def get_exchange(exchange):
+    from .exchange import ExchangeFactory
+
     return ExchangeFactory.from_str(exchange)
 
 class Cmd(object):
@@ -90,6 +90,8 @@ class Quote(Cmd):
                                  help="enable verbose output")
 
     def __call__(self, args):
+        from .exchange import ExchangeFactory, quote_many
+
         if args.verbose:
             enable_verbose_logs()
 
@@ -101,9 +103,13 @@ class Quote(Cmd):
             # get exchange object
             exchanges = [get_exchange(args.exchange)]
 
-        for exchange in exchanges:
+        # fetch quotes from all exchanges at once
+        quotes = quote_many([(exchange, args.base, args.quote)
+                             for exchange in exchanges])
+
+        for quote in quotes:
             try:
-                quote = exchange.quote(args.base, args.quote)
+                quote = quote.result()
             except ValueError as e:
                 print(e, file=sys.stderr)
                 continue
@@ -126,6 +132,8 @@ class List(Cmd):
         obj = args.type.lower()
 
         if obj == "exchanges":
+            from .exchange import ExchangeFactory
+
             exchanges = ExchangeFactory.EXCHANGES
 
             print("Supported exchanges:")
@@ -190,6 +198,8 @@ class Reset(Cmd):
                                  help="enable verbose output")
 
     def __call__(self, args):
+        from .cache import delete_cache
+
         if args.verbose:
             enable_verbose_logs()
 
@@ -225,6 +235,9 @@ ALIAS = {
 }
 
 def format_commands(man=False):
+    import io
+    import textwrap
+
     prefix = " " * 8
 
     wrapper = textwrap.TextWrapper(
@@ -236,7 +249,7 @@ def format_commands(man=False):
     with io.StringIO() as f:
         for name, func in CMDS.items():
             if man:
-                fo = func()
+                fo = load_cmd(name)
 
                 usage = fo.parser.format_usage()[len("usage: {} ".format(PROG)):].strip()
                 desc = wrapper.fill('\n'.join([l.strip() for l in fo.parser.description.splitlines() if l]))
@@ -252,12 +265,18 @@ def format_commands(man=False):
 
     return output.rstrip()
 
+@functools.lru_cache(maxsize=None)
+def load_cmd(cmd):
+    """Construct command, reusing any previously constructed instance"""
+
+    return CMDS[cmd]()
+
 def get_func(cmd):
     if cmd in ALIAS:
         cmd = ALIAS[cmd]
 
     try:
-        return CMDS[cmd]()
+        return load_cmd(cmd)
     except KeyError:
         print("Unknown command:", cmd, file=sys.stderr)
         print("See 'help' for usage.", file=sys.stderr)
@@ -12,12 +12,39 @@ class BaseAsset(object, metaclass=abc.ABCMeta):
     # asset symbol (e.g. £)
     SYMBOL = "?"
 
-    # format string for asset value
-    VALUE_FORMAT_STR = "%f"
+    # separator between asset symbol and value
+    SYMBOL_SEPARATOR = ""
+
+    # prefix for asset values, recomputed for each subclass
+    VALUE_PREFIX = SYMBOL + SYMBOL_SEPARATOR
+
+    # format spec for asset value
+    VALUE_FORMAT_SPEC = "f"
+
+    # set of names and symbol identifying asset, recomputed for each subclass
+    ALIASES = frozenset([NAME, SYMBOL] + ALT_NAMES)
 
     # dict of names for this asset given by various exchanges
     EXCHANGE_NAMES = {}
 
+    # map of asset names to the classes of all assets traded on an exchange,
+    # filled in as the classes are defined
+    REGISTRY = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super(BaseAsset, cls).__init_subclass__(**kwargs)
+
+        # symbol is fixed per class, so build the value prefix once here
+        cls.VALUE_PREFIX = cls.SYMBOL + cls.SYMBOL_SEPARATOR
+
+        # likewise the aliases, which are used for membership tests
+        cls.ALIASES = frozenset([cls.NAME, cls.SYMBOL] + cls.ALT_NAMES)
+
+        # register asset under its own and its exchanges' names
+        if cls.EXCHANGE_NAMES:
+            for name in [cls.NAME] + cls.ALT_NAMES + list(cls.EXCHANGE_NAMES.values()):
+                BaseAsset.REGISTRY[name] = cls
+
     def exchange_name(self, exchange):
         """Returns the name of this asset as used by the specified exchange
 
@@ -46,17 +73,18 @@ class BaseAsset(object, metaclass=abc.ABCMeta):
 
     @property
     def aliases(self):
-        return [self.NAME] + [self.SYMBOL] + self.ALT_NAMES
+        """Asset names and symbol"""
+
+        return self.ALIASES
 
     @property
     def value_prefix(self):
         """Assest value prefix"""
 
-        # just return the symbol itself
-        return self.SYMBOL
+        return self.VALUE_PREFIX
 
     def formatted_value(self, value):
-        return ("%s" + self.VALUE_FORMAT_STR) % (self.value_prefix, value)
+        return f"{self.VALUE_PREFIX}{value:{self.VALUE_FORMAT_SPEC}}"
 
 class UnknownAsset(BaseAsset):
     """Unknown asset"""
@@ -66,15 +94,8 @@ class UnknownAsset(BaseAsset):
 class CryptoAsset(BaseAsset):
     """Abstract cryptocurrency asset"""
 
-    @property
-    def value_prefix(self):
-        """Assest value prefix
-
-        Overrides parent. Cryptocurrencies should have an extra space between
-        the asset symbol and the value.
-        """
-
-        return "%s " % super(CryptoAsset, self).value_prefix
+    # cryptocurrencies have an extra space between the symbol and the value
+    SYMBOL_SEPARATOR = " "
 
 class BCHAsset(CryptoAsset):
     """Bitcoin Cash cryptocurrency"""
@@ -155,7 +176,7 @@ class FiatAsset(BaseAsset):
     """Abstract fiat currency asset"""
 
     # fiat currency values all have 2 decimal places
-    VALUE_FORMAT_STR = "%.2f"
+    VALUE_FORMAT_SPEC = ".2f"
 
 class EURAsset(FiatAsset):
     """Euro fiat currency"""
@@ -208,6 +229,8 @@ class USDAsset(FiatAsset):
 class BaseAssetPair(object, metaclass=abc.ABCMeta):
     """Represents a pair of assets on an exchange"""
 
+    __slots__ = ("pair_name", "pretty_name", "base_asset", "quote_asset")
+
     # exchange name
     EXCHANGE = None
 
@@ -224,13 +247,13 @@ class BaseAssetPair(object, metaclass=abc.ABCMeta):
         :type quote_asset: :class:`~cryptoprice.asset.BaseAsset`
         """
 
-        self.pair_name = str(pair_name)
-        self.pretty_name = str(pretty_name)
+        self.pair_name = pair_name
+        self.pretty_name = pretty_name
         self.base_asset = base_asset
         self.quote_asset = quote_asset
 
     def __str__(self):
-        return "%s (%s -> %s) on %s" % (self.asset_name,
+        return "%s (%s -> %s) on %s" % (self.pretty_name,
                                         self.base_asset.exchange_name(self.EXCHANGE),
                                         self.quote_asset.exchange_name(self.EXCHANGE),
                                         self.EXCHANGE)
@@ -238,6 +261,8 @@ class BaseAssetPair(object, metaclass=abc.ABCMeta):
 class KrakenAssetPair(BaseAssetPair):
     """Represents a pair of assets on Kraken"""
 
+    __slots__ = ("base_name", "quote_name")
+
     EXCHANGE = "Kraken"
 
     def __init__(self, pair_name, asset_data):
@@ -249,16 +274,22 @@ class KrakenAssetPair(BaseAssetPair):
         :type asset_data: dict
         """
 
-        # extract asset information
-        pair_name = str(pair_name)
-        pretty_name = str(asset_data["altname"])
-        base_asset = AssetFactory.from_str(asset_data["base"])
-        quote_asset = AssetFactory.from_str(asset_data["quote"])
+        # extract asset information, keeping Kraken's names as the assets may
+        # be unknown
+        pretty_name = asset_data["altname"]
+        self.base_name = asset_data["base"]
+        self.quote_name = asset_data["quote"]
+        base_asset = AssetFactory.from_str(self.base_name)
+        quote_asset = AssetFactory.from_str(self.quote_name)
 
         # construct asset pair
         super(KrakenAssetPair, self).__init__(pair_name, pretty_name,
                                               base_asset, quote_asset)
 
+    def __str__(self):
+        return "%s (%s -> %s) on %s" % (self.pretty_name, self.base_name,
+                                        self.quote_name, self.EXCHANGE)
+
     @property
     def quote_str(self):
         """Returns pair name used to obtain a quote
@@ -273,45 +304,27 @@ class KrakenAssetPair(BaseAssetPair):
 class AssetFactory(object):
     """Factory to return an asset given its name or pretty name"""
 
-    # asset class maps
-    CRYPTO_ASSETS = {
-        "BCH": BCHAsset,
-        "EOS": EOSAsset,
-        "ETH": ETHAsset,
-        "XETH": ETHAsset,
-        "DASH": DASHAsset,
-        "DOGE": DOGEAsset,
-        "XXDG": DOGEAsset,
-        "GNO": GNOAsset,
-        "BTC": BTCAsset,
-        "XXBT": BTCAsset
-    }
-    FIAT_ASSETS = {
-        "EUR": EURAsset,
-        "ZEUR": EURAsset,
-        "GBP": GBPAsset,
-        "ZGBP": GBPAsset,
-        "JPY": JPYAsset,
-        "ZJPY": JPYAsset,
-        "USD": USDAsset,
-        "ZUSD": USDAsset,
-    }
+    # asset class maps, derived from the names registered by each asset
+    CRYPTO_ASSETS = {name: asset for name, asset in BaseAsset.REGISTRY.items()
+                     if issubclass(asset, CryptoAsset)}
+    FIAT_ASSETS = {name: asset for name, asset in BaseAsset.REGISTRY.items()
+                   if issubclass(asset, FiatAsset)}
+
+    # shared asset objects for all registered names, and for unknown names
+    ASSETS = {name: asset() for name, asset in BaseAsset.REGISTRY.items()}
+    UNKNOWN_ASSET = UnknownAsset()
 
     @classmethod
-    def from_str(cls, asset_name, *args, **kwargs):
+    def from_str(cls, asset_name):
         """Returns asset given its name
 
+        Assets hold no state, so the same asset object is returned for
+        repeated calls with the same name.
+
         :param asset_name: asset name
         :type asset_name: str
         :return: asset object
         :rtype: :class:`~cryptoprice.asset.BaseAsset`
         """
 
-        # check if asset exists
-        if asset_name in cls.CRYPTO_ASSETS.keys():
-            return cls.CRYPTO_ASSETS[asset_name](*args, **kwargs)
-        elif asset_name in cls.FIAT_ASSETS.keys():
-            return cls.FIAT_ASSETS[asset_name](*args, **kwargs)
-        else:
-            # unknown asset
-            return UnknownAsset()
+        return cls.ASSETS.get(asset_name, cls.UNKNOWN_ASSET)
@@ -1,9 +1,27 @@
 """Cache file functions"""
 
 import os
-import appdirs
-import json
+import sys
 import logging
+import sqlite3
+import threading
+
+from .serialise import loads, dumps
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# name of the JSON cache file used before the cache database, in the same
+# directory
+LEGACY_CACHE_FILE = "cryptoprice.cache"
+
+# connection to cache database, shared by all cache operations and threads
+_connection = None
+
+# lock serialising use of the shared connection
+_lock = threading.RLock()
 
 def get_cache_path():
     """Get cache file path in user's home directory
@@ -12,24 +30,50 @@ def get_cache_path():
     :rtype: str
     """
 
-    # cache file in user's home directory
-    cache_dir = appdirs.user_cache_dir("cryptoprice")
-    cache_file = os.path.join(cache_dir, "cryptoprice.cache")
+    # cache file in user's platform-specific cache directory
+    if sys.platform.startswith("win"):
+        local_dir = os.environ.get("LOCALAPPDATA",
+                                   os.path.expanduser("~\\AppData\\Local"))
+        cache_dir = os.path.join(local_dir, "cryptoprice", "cryptoprice", "Cache")
+    elif sys.platform == "darwin":
+        cache_dir = os.path.expanduser("~/Library/Caches/cryptoprice")
+    else:
+        cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+        cache_dir = os.path.join(cache_home, "cryptoprice")
+
+    cache_file = os.path.join(cache_dir, "cryptoprice.db")
 
     return cache_file
 
-def read_cache(entry=None):
-    """Read cache entry
+def open_cache(create=False):
+    """Open connection to cache database
 
-    :param entry: cache entry to read
-    :type entry: hashable
-    :return: cache entry
-    :rtype: dict
-    :raises NoCacheException: if cache file does not exist
-    :raises InvalidCacheException: if cache is empty or invalid
+    The connection is kept open and reused by subsequent cache operations.
+
+    :param create: create cache database if it does not exist
+    :type create: bool
+    :return: database connection
+    :rtype: :class:`sqlite3.Connection`
+    :raises NoCacheException: if cache file does not exist and create is false
     """
 
-    logging.getLogger("cache").debug("Reading cache entry %s", entry)
+    global _connection
+
+    with _lock:
+        if _connection is None:
+            _connection = connect_cache(create)
+
+    return _connection
+
+def connect_cache(create):
+    """Connect to cache database
+
+    :param create: create cache database if it does not exist
+    :type create: bool
+    :return: database connection
+    :rtype: :class:`sqlite3.Connection`
+    :raises NoCacheException: if cache file does not exist and create is false
+    """
 
     cache_path = get_cache_path()
 
@@ -37,17 +81,116 @@ def read_cache(entry=None):
     if cache_path is None:
         raise CacheException()
 
-    # cache path must exist
     if not os.path.isfile(cache_path):
-        raise NoCacheException()
+        if not create:
+            raise NoCacheException()
+
+        logging.getLogger("cache").info("Creating new cache file")
+
+        # build cache directory
+        directory = os.path.dirname(cache_path)
+
+        # create cache directory
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+    # connection is shared between threads, with access serialised by the lock
+    connection = sqlite3.connect(cache_path, check_same_thread=False)
+
+    try:
+        # write-ahead log avoids rewriting the database on each commit
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("CREATE TABLE IF NOT EXISTS cache "
+                           "(k TEXT PRIMARY KEY, v BLOB)")
+    except sqlite3.DatabaseError:
+        # not a database
+        connection.close()
+        raise InvalidCacheException()
+
+    return connection
+
+def close_cache():
+    """Close connection to cache database, if open"""
+
+    global _connection
+
+    with _lock:
+        if _connection is not None:
+            _connection.close()
+            _connection = None
+
+def pack_entry(entry_dict):
+    """Serialise cache entry
+
+    Entries are packed with `msgpack` if it is installed, otherwise they are
+    stored as JSON.
+
+    :param entry_dict: entry to serialise
+    :type entry_dict: dict
+    :return: serialised entry
+    :rtype: bytes
+    """
+
+    if msgpack is not None:
+        return msgpack.packb(entry_dict, use_bin_type=True)
+
+    return dumps(entry_dict)
+
+def unpack_entry(value):
+    """Deserialise cache entry
+
+    :param value: serialised entry
+    :type value: bytes or str
+    :return: entry
+    :rtype: dict
+    :raises InvalidCacheException: if entry cannot be deserialised
+    """
+
+    try:
+        # entries are dicts, so JSON documents start with a brace whereas
+        # msgpack maps never do
+        if isinstance(value, str) or value[:1] == b"{":
+            return loads(value)
+
+        if msgpack is not None:
+            return msgpack.unpackb(value, raw=False)
+    except ValueError as e:
+        # corrupt
+        pass
+
+    raise InvalidCacheException()
+
+def read_cache(entry=None):
+    """Read cache entry
+
+    :param entry: cache entry to read, or None to read all entries
+    :type entry: str
+    :return: cache entry
+    :rtype: dict
+    :raises NoCacheException: if cache file or entry does not exist
+    :raises InvalidCacheException: if cache is invalid
+    """
+
+    logging.getLogger("cache").debug("Reading cache entry %s", entry)
+
+    with _lock:
+        connection = open_cache()
 
-    with open(cache_path, "r") as f:
         try:
-            cache_dict = json.loads(f.read())
-        except json.JSONDecodeError as e:
-            # empty or corrupt
+            if entry is not None:
+                rows = connection.execute("SELECT k, v FROM cache WHERE k=?",
+                                          (entry,)).fetchall()
+            else:
+                rows = connection.execute("SELECT k, v FROM cache").fetchall()
+        except sqlite3.DatabaseError:
             raise InvalidCacheException()
 
+    if entry is not None and not rows:
+        raise NoCacheException()
+
+    cache_dict = {key: unpack_entry(value) for key, value in rows}
+
     if entry is not None:
         return cache_dict[entry]
 
@@ -58,58 +201,64 @@ def write_cache(new_dict, entry):
 
     :param new_dict: new dict to cache
     :type new_dict: dict
-    :param entry: dict key to write new dict under
-    :type entry: hashable
+    :param entry: key to write new dict under, or None to replace the whole
+                  cache with the entries in new dict
+    :type entry: str
     """
 
-    cache_path = get_cache_path()
+    logging.getLogger("cache").debug("Writing cache entry %s", entry)
 
-    # cache path must be available
-    if cache_path is None:
-        raise CacheException()
+    if entry is not None:
+        rows = [(entry, pack_entry(new_dict))]
+    else:
+        rows = [(key, pack_entry(value)) for key, value in new_dict.items()]
 
-    logging.getLogger("cache").debug("Writing cache entry %s at %s",
-                                     entry, cache_path)
+    with _lock:
+        connection = open_cache(create=True)
 
-    if os.path.isfile(cache_path):
-        # update existing cache
-        cache_dict = read_cache()
-    else:
-        logging.getLogger("cache").info("Creating new cache file")
+        with connection:
+            if entry is None:
+                connection.execute("DELETE FROM cache")
 
-        # create new cache
-        cache_dict = {}
+            connection.executemany("INSERT OR REPLACE INTO cache (k, v) "
+                                   "VALUES (?, ?)", rows)
 
-        # build cache directory
-        directory = os.path.dirname(cache_path)
+def delete_cache():
+    """Delete cache file, and the JSON cache file used by earlier versions"""
 
-        # create cache directory
-        if not os.path.exists(directory):
-            os.makedirs(directory)
+    cache_path = get_cache_path()
+    legacy_cache_path = os.path.join(os.path.dirname(cache_path),
+                                     LEGACY_CACHE_FILE)
 
-    if entry is not None:
-        cache_dict[entry] = new_dict
-    else:
-        cache_dict = new_dict
+    with _lock:
+        close_cache()
 
-    with open(cache_path, "w+") as f:
-        json.dump(cache_dict, f)
+        # delete cache file if it exists
+        if os.path.exists(cache_path):
+            logging.getLogger("cache").info("Deleting cache file at %s",
+                                            cache_path)
 
-def delete_cache():
-    """Delete cache file"""
+            os.remove(cache_path)
 
-    cache_path = get_cache_path()
+            # remove write-ahead log files left behind by an unclean shutdown
+            for suffix in ("-wal", "-shm"):
+                if os.path.exists(cache_path + suffix):
+                    os.remove(cache_path + suffix)
+        else:
+            logging.getLogger("cache").debug("No cache file to delete")
 
-    # delete cache file if it exists
-    if os.path.exists(cache_path):
-        logging.getLogger("cache").info("Deleting cache file at %s", cache_path)
+        # delete old cache file, which is otherwise never touched again
+        if os.path.exists(legacy_cache_path):
+            logging.getLogger("cache").info("Deleting old cache file at %s",
+                                            legacy_cache_path)
 
-        os.remove(cache_path)
-    else:
-        logging.getLogger("cache").debug("No cache file to delete")
+            os.remove(legacy_cache_path)
+
+class CacheException(Exception):
+    pass
 
-class NoCacheException(Exception):
+class NoCacheException(CacheException):
     pass
 
-class InvalidCacheException(Exception):
+class InvalidCacheException(CacheException):
     pass
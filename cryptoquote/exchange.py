@@ -1,31 +1,192 @@
 """Classes for interacting with cryptocurrency exchanges"""
 
 import abc
+import time
+import types
+import functools
+import threading
+import concurrent.futures
 import requests
 import logging
 
 from .asset import AssetFactory, KrakenAssetPair, BTCAsset
 from .quote import Quote
+from .serialise import loads
 from .cache import read_cache, write_cache, NoCacheException, \
                    InvalidCacheException
 
+# HTTP session shared by all exchanges, keeping connections open between
+# requests
+_session = requests.Session()
+_session.mount("https://",
+               requests.adapters.HTTPAdapter(pool_connections=4,
+                                             pool_maxsize=16))
+
+# lock serialising access to the recent quotes shared by all exchanges
+_quote_cache_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=256)
+def format_url(url_format, *args):
+    """Returns URL built from a format string, reusing previously built URLs
+
+    :param url_format: URL format string
+    :type url_format: str
+    :return: URL
+    :rtype: str
+    """
+
+    return url_format.format(*args)
+
+def require(document, key):
+    """Returns field from a JSON document received from an exchange
+
+    :param document: decoded JSON document
+    :type document: dict
+    :param key: name of required field
+    :type key: str
+    :return: field value
+    :raises KeyError: if the document does not contain the field
+    """
+
+    value = document.get(key)
+
+    if value is None:
+        raise KeyError("Unexpected JSON data received")
+
+    return value
+
+def quote_many(quote_requests):
+    """Fetches quotes, possibly from several exchanges, concurrently
+
+    :param quote_requests: exchange, base asset name and quote asset name of
+                           each quote
+    :type quote_requests: sequence of (:class:`BaseExchange`, str, str)
+    :return: futures resolving to the quotes, in the order of the requests
+    :rtype: list of :class:`concurrent.futures.Future`
+    """
+
+    quote_requests = list(quote_requests)
+
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(1, min(len(quote_requests),
+                               BaseExchange.MAX_CONCURRENT_QUOTES)))
+
+    futures = [executor.submit(exchange.quote, base_name, quote_name)
+               for exchange, base_name, quote_name in quote_requests]
+
+    # let submitted quotes finish in the background
+    executor.shutdown(wait=False)
+
+    return futures
+
 class BaseExchange(object, metaclass=abc.ABCMeta):
     """Object representing a cryptocurrency exchange"""
 
     NAME = ""
     URL = ""
 
-    def quote(self, base_name, quote_name):
+    # HTTP session used for requests to this exchange
+    session = _session
+
+    # request timeout in seconds
+    TIMEOUT = 10
+
+    # map of base and quote asset aliases to asset pairs, built on first use
+    _pair_index = None
+
+    # time in seconds for which a quote is reused, and number of quotes kept
+    QUOTE_TTL = 3.0
+    QUOTE_CACHE_SIZE = 256
+
+    # recent quotes from all exchanges, keyed by exchange and asset names
+    _quote_cache = {}
+
+    # maximum number of quotes fetched at the same time
+    MAX_CONCURRENT_QUOTES = 8
+
+    def quote(self, base_name, quote_name, force_refresh=False):
         """Returns quote for the specified asset pair
 
+        Quotes fetched within the last :attr:`QUOTE_TTL` seconds are reused.
+        The same quote object is then returned to every caller, so it should
+        not be modified.
+
         :param base_name: base asset name, or asset pair name
         :type base_name: str
         :param quote_name: (optional) quote asset name
         :type quote_name: str
+        :param force_refresh: fetch a new quote even if a recent one exists
+        :type force_refresh: bool
         :return: quote
         :rtype: :class:`~cryptoprice.quote.Quote`
         """
 
+        base, quote = self.names_to_assets(base_name, quote_name)
+
+        key = (self.NAME, base.NAME, quote.NAME)
+        now = time.monotonic()
+
+        if not force_refresh:
+            # check for recent quote
+            with _quote_cache_lock:
+                cached = self._quote_cache.get(key)
+
+            if cached is not None and now - cached[0] < self.QUOTE_TTL:
+                return cached[1]
+
+        # handle quote for this exchange
+        result = self.handle_quote(base, quote)
+
+        # store quote as the newest entry, dropping the oldest if full
+        with _quote_cache_lock:
+            self._quote_cache.pop(key, None)
+            self._quote_cache[key] = (now, result)
+
+            while len(self._quote_cache) > self.QUOTE_CACHE_SIZE:
+                self._quote_cache.pop(next(iter(self._quote_cache)))
+
+        return result
+
+    def quotes(self, asset_names):
+        """Returns quotes for the specified asset pairs
+
+        Unlike :meth:`quote`, this always fetches new quotes and neither reads
+        nor stores the recent quotes.
+
+        :param asset_names: base and quote asset names of each pair
+        :type asset_names: sequence of (str, str)
+        :return: quotes, in the order of the specified pairs
+        :rtype: list of :class:`~cryptoprice.quote.Quote`
+        """
+
+        assets = [self.names_to_assets(base_name, quote_name)
+                  for base_name, quote_name in asset_names]
+
+        # handle quotes for this exchange
+        return self.handle_quotes(assets)
+
+    def get_json(self, url):
+        """Fetches and decodes a JSON document
+
+        :param url: document URL
+        :type url: str
+        :return: decoded document
+        """
+
+        return loads(self.session.get(url, timeout=self.TIMEOUT).content)
+
+    def names_to_assets(self, base_name, quote_name):
+        """Returns the assets corresponding to the specified names
+
+        :param base_name: base asset name
+        :type base_name: str
+        :param quote_name: quote asset name
+        :type quote_name: str
+        :return: base and quote assets
+        :rtype: tuple of :class:`~cryptoprice.asset.BaseAsset`
+        :raises ValueError: if either asset cannot be handled by this exchange
+        """
+
         # parse asset names
         base = AssetFactory.from_str(base_name)
         quote = AssetFactory.from_str(quote_name)
@@ -36,8 +197,7 @@ class BaseExchange(object, metaclass=abc.ABCMeta):
         if not quote.can_handle_exchange(self):
             raise ValueError("%s cannot handle %s asset" % (self.NAME, quote))
 
-        # handle quote for this exchange
-        return self.handle_quote(base, quote)
+        return base, quote
 
     @abc.abstractmethod
     def handle_quote(self, base, quote):
@@ -53,14 +213,39 @@ class BaseExchange(object, metaclass=abc.ABCMeta):
 
         return NotImplemented
 
+    def handle_quotes(self, assets):
+        """Returns quotes for the specified asset pairs
+
+        By default, handles each quote concurrently, so that the network
+        latencies of any requests overlap. Exchanges returning several quotes
+        in one response override this to fetch them with a single request.
+
+        :param assets: base and quote assets of each pair
+        :type assets: sequence of (:class:`~cryptoprice.asset.BaseAsset`,
+                      :class:`~cryptoprice.asset.BaseAsset`)
+        :return: quotes, in the order of the specified pairs
+        :rtype: list of :class:`~cryptoprice.quote.Quote`
+        """
+
+        assets = list(assets)
+
+        if len(assets) < 2:
+            return [self.handle_quote(base, quote) for base, quote in assets]
+
+        workers = min(len(assets), self.MAX_CONCURRENT_QUOTES)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda pair: self.handle_quote(*pair),
+                                     assets))
+
     def asset_pairs(self):
-        """Generates sequence of asset pairs available at this exchange
+        """Returns list of asset pairs available at this exchange
 
         By default, returns an empty list. This may be overridden by subclasses
         to return a list of exchange-specific asset pairs.
 
         :return: asset pairs
-        :rtype: sequence of :class:`~cryptoprice.asset.KrakenAssetPair`
+        :rtype: list of :class:`~cryptoprice.asset.BaseAssetPair`
         """
 
         return []
@@ -77,12 +262,33 @@ class BaseExchange(object, metaclass=abc.ABCMeta):
         :raises ValueError: if assets can't be formed into a known pair
         """
 
+        if self._pair_index is None:
+            self._pair_index = self.build_pair_index()
+
+        try:
+            return self._pair_index[(base.NAME, quote.NAME)]
+        except KeyError:
+            raise ValueError("Specified assets cannot be formed into a known "
+                             "pair on %s" % self.NAME)
+
+    def build_pair_index(self):
+        """Builds map of base and quote asset aliases to asset pairs
+
+        Where several pairs share aliases, the first pair listed by
+        :meth:`asset_pairs` is used.
+
+        :return: asset pairs keyed by base and quote asset alias
+        :rtype: dict
+        """
+
+        pair_index = {}
+
         for pair in self.asset_pairs():
-            if base.NAME in pair.base_asset.aliases and quote.NAME in pair.quote_asset.aliases:
-                return pair
+            for base_alias in pair.base_asset.aliases:
+                for quote_alias in pair.quote_asset.aliases:
+                    pair_index.setdefault((base_alias, quote_alias), pair)
 
-        raise ValueError("Specified assets cannot be formed into a known pair "
-                         "on %s" % self.NAME)
+        return pair_index
 
     def __str__(self):
         """String representation"""
@@ -97,39 +303,118 @@ class Kraken(BaseExchange):
     # asset pairs URL
     ASSET_PAIR_URL = "https://api.kraken.com/0/public/AssetPairs"
 
+    # time in seconds before cached asset pairs are fetched again
+    ASSET_PAIR_CACHE_TTL = 86400
+
     # price URL
     TICKER_URL = "https://api.kraken.com/0/public/Ticker"
+    TICKER_QUERY_URL = TICKER_URL + "?pair={}"
+
+    # asset pair cache entry and asset pairs, kept in memory once loaded
+    _asset_pair_cache = None
+    _asset_pairs = None
+
+    def asset_pair_data(self):
+        """Returns asset pair information, from the cache if it is fresh
+
+        :return: asset pair document provided by Kraken
+        :rtype: dict
+        """
+
+        cache_dict = self._asset_pair_cache
+
+        if cache_dict is None:
+            # get asset pairs from cache
+            try:
+                cache_dict = read_cache("kraken_asset_pairs")
+            except (NoCacheException, InvalidCacheException) as e:
+                # empty or invalid cache
+                logging.getLogger("exchange").info("Asset cache not found")
+
+        if cache_dict is not None:
+            # entries written by older versions have no fetch time
+            fetched_at = cache_dict.get("fetched_at", 0)
+
+            if time.time() - fetched_at < self.ASSET_PAIR_CACHE_TTL:
+                self._asset_pair_cache = cache_dict
+
+                return cache_dict["data"]
+
+            logging.getLogger("exchange").info("Asset cache expired")
+
+        return self.refresh_asset_pairs()
+
+    def refresh_asset_pairs(self):
+        """Fetches asset pair information from Kraken and caches it
+
+        :return: asset pair document provided by Kraken
+        :rtype: dict
+        """
+
+        # get and decode JSON document with asset pairs
+        asset_pair_dict = self.get_json(self.ASSET_PAIR_URL)
+
+        # well-formatted document will contain a "result" field, from which
+        # decimal versions of pairs are dropped so they are not cached
+        asset_pair_dict["result"] = {pair: asset_data for pair, asset_data
+                                     in require(asset_pair_dict, "result").items()
+                                     if not pair.endswith(".d")}
+
+        cache_dict = {"fetched_at": time.time(), "data": asset_pair_dict}
+
+        # save cache
+        write_cache(cache_dict, "kraken_asset_pairs")
+
+        # pairs may have changed
+        self._asset_pair_cache = cache_dict
+        self._asset_pairs = None
+        self._pair_index = None
+
+        return asset_pair_dict
 
     def asset_pairs(self):
-        """Generates sequence of asset pairs available at this exchange
+        """Returns list of asset pairs available at this exchange
+
+        The list is built once and shared until the pairs are refreshed, so it
+        should not be modified.
 
         :return: asset pairs
-        :rtype: sequence of :class:`~cryptoprice.asset.KrakenAssetPair`
+        :rtype: list of :class:`~cryptoprice.asset.KrakenAssetPair`
         """
 
-        # get asset pairs from cache
-        try:
-            asset_pair_dict = read_cache("kraken_asset_pairs")
-        except (NoCacheException, InvalidCacheException) as e:
-            # empty or invalid cache
-            logging.getLogger("exchange").info("Asset cache not found")
+        # refreshes the asset pairs if they have expired
+        asset_pair_dict = self.asset_pair_data()
 
-            # get and decode JSON document with asset pairs
-            asset_pair_dict = requests.get(self.ASSET_PAIR_URL).json()
+        if self._asset_pairs is None:
+            # decimal versions of pairs were already dropped when fetched
+            self._asset_pairs = [KrakenAssetPair(asset_pair, asset_data)
+                                 for asset_pair, asset_data
+                                 in asset_pair_dict["result"].items()]
 
-            # save cache
-            write_cache(asset_pair_dict, "kraken_asset_pairs")
+        return self._asset_pairs
 
-        # well-formatted document will contain a "result" field
-        if not "result" in asset_pair_dict.keys():
-            raise KeyError("Unexpected JSON data received")
+    def assets_to_pair(self, base, quote):
+        """Returns the pair name corresponding to the specified assets
 
-        for asset_pair in asset_pair_dict["result"].keys():
-            if asset_pair[-2:] == ".d":
-                # skip decimal versions
-                continue
+        Most Kraken pairs are named by joining the Kraken names of their base
+        and quote assets, so that name is tried before searching every pair.
 
-            yield KrakenAssetPair(asset_pair, asset_pair_dict["result"][asset_pair])
+        :param base: base asset
+        :type base: :class:`~cryptoprice.asset.BaseAsset`
+        :param quote: quote asset
+        :type quote: :class:`~cryptoprice.asset.BaseAsset`
+        :return: asset pair
+        :rtype: :class:`~cryptoprice.asset.KrakenAssetPair`
+        :raises ValueError: if assets can't be formed into a known pair
+        """
+
+        pair_name = base.exchange_name(self.NAME) + quote.exchange_name(self.NAME)
+        asset_data = self.asset_pair_data()["result"].get(pair_name)
+
+        if asset_data is not None:
+            return KrakenAssetPair(pair_name, asset_data)
+
+        return super(Kraken, self).assets_to_pair(base, quote)
 
     def handle_quote(self, base, quote):
         """Returns quote for the specified asset pair
@@ -142,36 +427,71 @@ class Kraken(BaseExchange):
         :rtype: :class:`~cryptoprice.quote.Quote`
         """
 
-        # form Kraken asset pair
-        asset_pair = self.assets_to_pair(base, quote)
+        return self.handle_quotes([(base, quote)])[0]
+
+    def handle_quotes(self, assets):
+        """Returns quotes for the specified asset pairs
+
+        Kraken's ticker accepts a list of pairs, so all quotes are fetched with
+        a single request.
+
+        :param assets: base and quote assets of each pair
+        :type assets: sequence of (:class:`~cryptoprice.asset.BaseAsset`,
+                      :class:`~cryptoprice.asset.BaseAsset`)
+        :return: quotes, in the order of the specified pairs
+        :rtype: list of :class:`~cryptoprice.quote.Quote`
+        """
+
+        # nothing to request
+        if not assets:
+            return []
+
+        # form Kraken asset pairs
+        asset_pairs = [self.assets_to_pair(base, quote) for base, quote in assets]
 
         # get and decode JSON document with prices
-        quote_dict = requests.get(self.ticker_url(asset_pair)).json()
+        quote_dict = self.get_json(self.ticker_url(*asset_pairs))
 
         # well-formatted document will contain a "result" field
-        if not "result" in quote_dict.keys():
-            raise KeyError("Unexpected JSON data received")
+        result = require(quote_dict, "result")
 
-        # extract prices from result dict
-        prices = quote_dict["result"][asset_pair.pair_name]
+        return [self.ticker_to_quote(asset_pair, result[asset_pair.pair_name])
+                for asset_pair in asset_pairs]
+
+    def ticker_to_quote(self, asset_pair, prices):
+        """Returns quote built from ticker information for an asset pair
+
+        :param asset_pair: asset pair the prices are for
+        :type asset_pair: :class:`~cryptoprice.asset.KrakenAssetPair`
+        :param prices: ticker information provided by Kraken for the pair
+        :type prices: dict
+        :return: quote
+        :rtype: :class:`~cryptoprice.quote.Quote`
+        """
+
+        # low and high prices hold today's and last 24h values
+        low = prices["l"]
+        high = prices["h"]
 
         # build and return quote
         return Quote(self.NAME, asset_pair.base_asset, asset_pair.quote_asset,
                      ask_price=prices["a"][0], bid_price=prices["b"][0],
-                     last_trade_price=prices["c"][0], today_low=prices["l"][0],
-                     today_high=prices["h"][0], twenty_four_low=prices["l"][1],
-                     twenty_four_high=prices["h"][1])
+                     last_trade_price=prices["c"][0], today_low=low[0],
+                     today_high=high[0], twenty_four_low=low[1],
+                     twenty_four_high=high[1])
 
-    def ticker_url(self, asset_pair):
-        """Returns URL for the specified asset pair
+    def ticker_url(self, *asset_pairs):
+        """Returns URL for the specified asset pairs
 
-        :param asset_pair: asset pair to get prices for
-        :type asset_pair: :class:`~cryptoprice.asset.BaseAssetPair`
+        :param asset_pairs: asset pairs to get prices for
+        :type asset_pairs: :class:`~cryptoprice.asset.BaseAssetPair`
         :return: URL
         :rtype: str
         """
 
-        return self.TICKER_URL + "?pair=%s" % asset_pair.quote_str
+        return format_url(self.TICKER_QUERY_URL,
+                          ",".join(asset_pair.quote_str
+                                   for asset_pair in asset_pairs))
 
 class LocalBitcoins(BaseExchange):
     # basic information
@@ -193,20 +513,64 @@ class LocalBitcoins(BaseExchange):
         """
 
         # get and decode JSON document with prices
-        quote_dict = requests.get(self.TICKER_URL).json()
+        quote_dict = self.get_json(self.TICKER_URL)
+
+        return self.ticker_to_quote(quote_dict, base, quote)
 
-        # find quote price in dict
-        for currency in quote_dict.keys():
-            if currency in quote.aliases:
-                # found currency
-                prices = quote_dict[currency]
+    def handle_quotes(self, assets):
+        """Returns quotes for the specified asset pairs
 
-                # build and return quote
-                return Quote(self.NAME, base, quote,
-                             last_trade_price=prices["rates"]["last"],
-                             twenty_four_avg=prices["avg_24h"])
+        LocalBitcoins' ticker lists every currency, so all quotes are built from
+        a single request.
 
-        raise ValueError("%s not quoted on %s" % (quote_name, self.NAME))
+        :param assets: base and quote assets of each pair
+        :type assets: sequence of (:class:`~cryptoprice.asset.BaseAsset`,
+                      :class:`~cryptoprice.asset.BaseAsset`)
+        :return: quotes, in the order of the specified pairs
+        :rtype: list of :class:`~cryptoprice.quote.Quote`
+        """
+
+        # nothing to request
+        if not assets:
+            return []
+
+        # get and decode JSON document with prices
+        quote_dict = self.get_json(self.TICKER_URL)
+
+        return [self.ticker_to_quote(quote_dict, base, quote)
+                for base, quote in assets]
+
+    def ticker_to_quote(self, quote_dict, base, quote):
+        """Returns quote built from the ticker for the specified asset pair
+
+        :param quote_dict: ticker document provided by LocalBitcoins
+        :type quote_dict: dict
+        :param base: base asset
+        :type base: :class:`~cryptoprice.asset.BaseAsset`
+        :param quote: quote asset
+        :type quote: :class:`~cryptoprice.asset.BaseAsset`
+        :return: quote
+        :rtype: :class:`~cryptoprice.quote.Quote`
+        :raises ValueError: if quote asset is not in the ticker
+        """
+
+        # find quote price in dict, probing it with the currency's name and
+        # then its few aliases rather than scanning every quoted currency
+        if quote.NAME in quote_dict:
+            currency = quote.NAME
+        else:
+            currency = next((alias for alias in quote.aliases
+                             if alias in quote_dict), None)
+
+        if currency is None:
+            raise ValueError("%s not quoted on %s" % (quote, self.NAME))
+
+        prices = quote_dict[currency]
+
+        # build and return quote
+        return Quote(self.NAME, base, quote,
+                     last_trade_price=prices["rates"]["last"],
+                     twenty_four_avg=prices["avg_24h"])
 
 class Coinbase(BaseExchange):
     # basic information
@@ -228,21 +592,17 @@ class Coinbase(BaseExchange):
         """
 
         # get and decode JSON document with prices
-        quote_dict = requests.get(self.ticker_url(base, quote)).json()
+        quote_dict = self.get_json(self.ticker_url(base, quote))
 
         # well-formatted document will contain a "data" field
-        if not "data" in quote_dict.keys():
-            raise KeyError("Unexpected JSON data received")
-
-        # extract prices from result dict
-        price = quote_dict["data"]
+        price = require(quote_dict, "data")
 
-        if "amount" in price.keys():
+        if "amount" in price:
             # build and return quote
             return Quote(self.NAME, base, quote,
                          last_trade_price=price["amount"])
 
-        raise ValueError("%s not quoted on %s" % (quote_name, self.NAME))
+        raise ValueError("%s not quoted on %s" % (quote, self.NAME))
 
     def ticker_url(self, base, quote):
         """Returns URL for the specified asset pair
@@ -255,18 +615,18 @@ class Coinbase(BaseExchange):
         :rtype: str
         """
 
-        return self.SPOT_PRICE_URL.format(base.EXCHANGE_NAMES[self.NAME],
-                                          quote.EXCHANGE_NAMES[self.NAME])
+        return format_url(self.SPOT_PRICE_URL, base.EXCHANGE_NAMES[self.NAME],
+                          quote.EXCHANGE_NAMES[self.NAME])
 
 class ExchangeFactory(object):
     """Factory to return an exchange given its name"""
 
-    # exchange class map
-    EXCHANGES = {
+    # exchange class map, keyed by lower case name
+    EXCHANGES = types.MappingProxyType({
         "kraken": Kraken,
         "localbitcoins": LocalBitcoins,
         "coinbase": Coinbase
-    }
+    })
 
     @classmethod
     def from_str(cls, exchange_name, *args, **kwargs):
@@ -279,10 +639,10 @@ class ExchangeFactory(object):
         :raises ValueError: if exchange name is unrecognised
         """
 
-        exchange_name = exchange_name.lower()
+        exchange_class = cls.EXCHANGES.get(exchange_name.lower())
 
         # check if exchange exists
-        if exchange_name in cls.EXCHANGES.keys():
-            return cls.EXCHANGES[exchange_name](*args, **kwargs)
+        if exchange_class is None:
+            raise ValueError("Unrecognised exchange")
 
-        raise ValueError("Unrecognised exchange")
+        return exchange_class(*args, **kwargs)
@@ -1,10 +1,24 @@
 """Classes for handling price quotes on an exchange for a pair of assets"""
 
+import sys
 from datetime import datetime
 
+from .serialise import dumps
+
+# current local time, bound once to skip the method lookup for each quote
+_now = datetime.now
+
 class Quote(object):
     """Represents a price quote for a pair of assets on an exchange"""
 
+    # names of price attributes, in constructor argument order
+    PRICE_FIELDS = ("ask_price", "bid_price", "last_trade_price", "today_low",
+                    "today_high", "today_avg", "twenty_four_low",
+                    "twenty_four_high", "twenty_four_avg")
+
+    __slots__ = ("exchange", "base_asset", "quote_asset") + PRICE_FIELDS + \
+                ("time", "_formatted_time", "_formatted_from")
+
     def __init__(self, exchange, base_asset, quote_asset, ask_price=None,
                  bid_price=None, last_trade_price=None, today_low=None,
                  today_high=None, today_avg=None, twenty_four_low=None,
@@ -39,60 +53,67 @@ class Quote(object):
         :type time: :class:`datetime.datetime`
         """
 
-        # validate inputs
-        self.exchange = str(exchange)
+        # validate inputs, keeping one copy of each exchange name as it is
+        # shared by many quotes
+        if type(exchange) is str:
+            self.exchange = sys.intern(exchange)
+        else:
+            self.exchange = str(exchange)
+
         self.base_asset = base_asset
         self.quote_asset = quote_asset
 
-        if ask_price is not None:
-            ask_price = float(ask_price)
-
-        if bid_price is not None:
-            bid_price = float(bid_price)
-
-        if last_trade_price is not None:
-            last_trade_price = float(last_trade_price)
-
-        if today_low is not None:
-            today_low = float(today_low)
+        if time is None:
+            time = _now()
 
-        if today_high is not None:
-            today_high = float(today_high)
+        # convert prices to floats, leaving missing prices and floats as they are
+        for name, value in zip(self.PRICE_FIELDS,
+                               (ask_price, bid_price, last_trade_price,
+                                today_low, today_high, today_avg,
+                                twenty_four_low, twenty_four_high,
+                                twenty_four_avg)):
+            if value is not None and type(value) is not float:
+                value = float(value)
 
-        if today_avg is not None:
-            today_avg = float(today_avg)
+            setattr(self, name, value)
 
-        if twenty_four_low is not None:
-            twenty_four_low = float(twenty_four_low)
+        self.time = time
 
-        if twenty_four_high is not None:
-            twenty_four_high = float(twenty_four_high)
+        # formatted time and the time it was formatted from, set on first use
+        self._formatted_time = None
+        self._formatted_from = None
 
-        if twenty_four_avg is not None:
-            twenty_four_avg = float(twenty_four_avg)
+    def to_dict(self):
+        """Get quote data
 
-        if time is None:
-            time = datetime.now()
-
-        self.ask_price = ask_price
-        self.bid_price = bid_price
-        self.last_trade_price = last_trade_price
-        self.today_low = today_low
-        self.today_high = today_high
-        self.today_avg = today_avg
-        self.twenty_four_low = twenty_four_low
-        self.twenty_four_high = twenty_four_high
-        self.twenty_four_avg = twenty_four_avg
-        self.time = time
-
-    def __str__(self):
-        """String representation of quote
+        :return: quote data, with assets given by name
+        :rtype: dict
+        """
 
-        :return: quote information
-        :rtype: str
+        return {
+            "exchange": self.exchange,
+            "base_asset": str(self.base_asset),
+            "quote_asset": str(self.quote_asset),
+            "ask_price": self.ask_price,
+            "bid_price": self.bid_price,
+            "last_trade_price": self.last_trade_price,
+            "today_low": self.today_low,
+            "today_high": self.today_high,
+            "today_avg": self.today_avg,
+            "twenty_four_low": self.twenty_four_low,
+            "twenty_four_high": self.twenty_four_high,
+            "twenty_four_avg": self.twenty_four_avg,
+            "time": self.time
+        }
+
+    def to_json(self):
+        """Get quote data as JSON
+
+        :return: JSON document with quote data, with the time in ISO 8601 format
+        :rtype: bytes
         """
 
-        return self.info()
+        return dumps(self.to_dict())
 
     def info(self):
         """Get quote information
@@ -101,72 +122,32 @@ class Quote(object):
         :rtype: str
         """
 
-        # locale-aware time
-        time_str = self.time.strftime("%x %X")
-
-        # prices
-        if self.ask_price is not None:
-            ask_price_str = self.quote_asset.formatted_value(self.ask_price)
-        else:
-            ask_price_str = "?"
-
-        if self.bid_price is not None:
-            bid_price_str = self.quote_asset.formatted_value(self.bid_price)
-        else:
-            bid_price_str = "?"
-
-        if self.last_trade_price is not None:
-            last_trade_price_str = self.quote_asset.formatted_value(self.last_trade_price)
-        else:
-            last_trade_price_str = "?"
+        # locale-aware time, formatted again only if the time has changed
+        if self._formatted_from is not self.time:
+            self._formatted_time = self.time.strftime("%x %X")
+            self._formatted_from = self.time
 
-        if self.today_low is not None:
-            today_low_str = self.quote_asset.formatted_value(self.today_low)
-        else:
-            today_low_str = "?"
+        time_str = self._formatted_time
 
-        if self.twenty_four_low is not None:
-            twenty_four_low_str = self.quote_asset.formatted_value(self.twenty_four_low)
-        else:
-            twenty_four_low_str = "?"
+        # look up formatter once rather than for every price
+        formatted_value = self.quote_asset.formatted_value
 
-        if self.today_high is not None:
-            today_high_str = self.quote_asset.formatted_value(self.today_high)
-        else:
-            today_high_str = "?"
+        # prices, with missing prices shown as "?"
+        prices = [getattr(self, name) for name in self.PRICE_FIELDS]
 
-        if self.twenty_four_high is not None:
-            twenty_four_high_str = self.quote_asset.formatted_value(self.twenty_four_high)
-        else:
-            twenty_four_high_str = "?"
+        (ask_price_str, bid_price_str, last_trade_price_str, today_low_str,
+         today_high_str, today_avg_str, twenty_four_low_str,
+         twenty_four_high_str, twenty_four_avg_str) = [
+             "?" if price is None else formatted_value(price)
+             for price in prices]
 
-        if self.today_avg is not None:
-            today_avg_str = self.quote_asset.formatted_value(self.today_avg)
-        else:
-            today_avg_str = "?"
+        return (f"{self.base_asset} price on {self.exchange} as of {time_str}:\n"
+                f"\tAsk: {ask_price_str}\n"
+                f"\tBid: {bid_price_str}\n"
+                f"\tLast: {last_trade_price_str}\n"
+                f"\tToday low: {today_low_str} (last 24h: {twenty_four_low_str})\n"
+                f"\tToday high: {today_high_str} (last 24h: {twenty_four_high_str})\n"
+                f"\tToday average: {today_avg_str} (last 24h: {twenty_four_avg_str})")
 
-        if self.twenty_four_avg is not None:
-            twenty_four_avg_str = self.quote_asset.formatted_value(self.twenty_four_avg)
-        else:
-            twenty_four_avg_str = "?"
-
-        return ("%s price on %s as of %s:\n"
-               "\tAsk: %s\n"
-               "\tBid: %s\n"
-               "\tLast: %s\n"
-               "\tToday low: %s (last 24h: %s)\n"
-               "\tToday high: %s (last 24h: %s)\n"
-               "\tToday average: %s (last 24h: %s)") % (
-               self.base_asset,
-               self.exchange,
-               time_str,
-               ask_price_str,
-               bid_price_str,
-               last_trade_price_str,
-               today_low_str,
-               twenty_four_low_str,
-               today_high_str,
-               twenty_four_high_str,
-               today_avg_str,
-               twenty_four_avg_str
-        )
+    # string representation of quote is its information
+    __str__ = info
@@ -0,0 +1,54 @@
+"""JSON serialisation functions
+
+Uses `orjson` if it is installed, otherwise falls back to the standard library.
+"""
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+def loads(data):
+    """Deserialise JSON document
+
+    :param data: JSON document
+    :type data: bytes or str
+    :return: deserialised document
+    :raises ValueError: if document is invalid
+    """
+
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
+
+def dumps(obj):
+    """Serialise object to JSON document
+
+    Dates and times are serialised in ISO 8601 format.
+
+    :param obj: object to serialise
+    :return: JSON document
+    :rtype: bytes
+    """
+
+    if orjson is not None:
+        return orjson.dumps(obj)
+
+    return json.dumps(obj, default=isoformat).encode("utf-8")
+
+def isoformat(obj):
+    """Serialise date or time for the standard library JSON encoder
+
+    :param obj: date or time
+    :return: ISO 8601 date or time
+    :rtype: str
+    :raises TypeError: if object is not a date or time
+    """
+
+    try:
+        return obj.isoformat()
+    except AttributeError:
+        raise TypeError("Object of type %s is not JSON serializable"
+                        % type(obj).__name__)